@@ -1,67 +1,107 @@
 """
 CRUD operations for database models.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.models import User
 from app.schemas import UserCreate
-from app.security import hash_password
+from app.security import hash_password_async, hash_passwords_bulk
 
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """
     Create a new user with hashed password.
-    
+
+    Username and email are stored lowercase.
+
     Args:
         db: Database session
         user: UserCreate schema with plain password
-        
+
     Returns:
         Created User object
-        
+
     Raises:
         IntegrityError: If username or email already exists
     """
-    hashed_pwd = hash_password(user.password)
+    hashed_pwd = await hash_password_async(user.password)
     db_user = User(
-        username=user.username,
-        email=user.email,
+        username=user.username.lower(),
+        email=user.email.lower(),
         password_hash=hashed_pwd
     )
-    
+
     try:
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
+        raise e
+
+
+async def create_users_bulk(db: AsyncSession, users: list[UserCreate]) -> list[User]:
+    """
+    Create many users in a single INSERT.
+
+    Passwords are hashed in parallel on part of the hashing process pool,
+    then all rows are written with one multi-row INSERT ... RETURNING.
+
+    Args:
+        db: Database session
+        users: UserCreate schemas with plain passwords
+
+    Returns:
+        Created User objects, in input order
+
+    Raises:
+        IntegrityError: If any username or email already exists
+    """
+    if not users:
+        return []
+
+    hashed_pwds = await hash_passwords_bulk([user.password for user in users])
+    rows = [
+        {"username": user.username.lower(), "email": user.email.lower(), "password_hash": hashed_pwd}
+        for user, hashed_pwd in zip(users, hashed_pwds)
+    ]
+
+    try:
+        result = await db.scalars(insert(User).returning(User, sort_by_parameter_order=True), rows)
+        db_users = result.all()
+        await db.commit()
+        return db_users
+    except IntegrityError as e:
+        await db.rollback()
         raise e
 
 
-def get_user_by_username(db: Session, username: str) -> User | None:
+async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
     """
-    Get user by username.
-    
+    Get user by username, ignoring case.
+
     Args:
         db: Database session
         username: Username to search for
-        
+
     Returns:
         User object or None if not found
     """
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(func.lower(User.username) == username.lower()))
+    return result.scalar_one_or_none()
 
 
-def get_user_by_email(db: Session, email: str) -> User | None:
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """
-    Get user by email.
-    
+    Get user by email, ignoring case.
+
     Args:
         db: Database session
         email: Email to search for
-        
+
     Returns:
         User object or None if not found
     """
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(func.lower(User.email) == email.lower()))
+    return result.scalar_one_or_none()
@@ -1,27 +1,61 @@
 """
 FastAPI application entry point.
 """
-from fastapi import FastAPI
+import logging
+from uuid import uuid4
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
+# Reuse uvicorn's logger so startup messages show up alongside server logs
+logger = logging.getLogger("uvicorn.error")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
-    Lifespan event handler - initialize DB on startup.
+    Lifespan event handler - initialize DB on startup, close the pool on shutdown.
     """
-    from app.database import init_db
-    init_db()
+    from app.config import HASH_AUTOTUNE, HASH_TARGET_MS
+    from app.database import engine, init_db
+    from app.schemas import warm_up_schemas
+    from app.security import MAX_HASH_TIME_COST, calibrate_hash_cost, shutdown_hash_pool
+    await init_db()
+    warm_up_schemas()
+    logger.info("Database pool ready: %s", engine.pool.status())
+    if HASH_AUTOTUNE:
+        time_cost = calibrate_hash_cost(HASH_TARGET_MS / 1000)
+        logger.info("Password hashing calibrated: argon2 time_cost=%d", time_cost)
+        if time_cost == MAX_HASH_TIME_COST:
+            logger.warning(
+                "Password hashing calibration reached the time_cost cap (%d) within the %dms target; "
+                "set ARGON2_TIME_COST and HASH_AUTOTUNE=false to pin the cost",
+                MAX_HASH_TIME_COST, HASH_TARGET_MS
+            )
     yield
+    shutdown_hash_pool()
+    await engine.dispose()
 
 
 app = FastAPI(
     title="User Management API",
     description="FastAPI application with user registration and authentication",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """
+    Scope the database session to the request and release it once the response is ready.
+    """
+    from app.database import session_scope
+    async with session_scope(uuid4().hex):
+        return await call_next(request)
+
+
 # Include routers
 from app.routes import router as user_router
 app.include_router(user_router)
@@ -1,8 +1,10 @@
 """
 SQLAlchemy database models.
 """
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
+from uuid6 import uuid7
 from app.database import Base
 
 
@@ -12,16 +14,21 @@ class User(Base):
     """
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, nullable=False, index=True)
-    email = Column(String, unique=True, nullable=False, index=True)
+    # Time-ordered UUIDv7 keeps primary key inserts append-only without a shared sequence
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    username = Column(String, nullable=False)
+    email = Column(String, nullable=False)
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (
-        UniqueConstraint('username', name='uq_username'),
-        UniqueConstraint('email', name='uq_email'),
+        # Case-insensitive uniqueness; also serves the lower() lookups in crud
+        Index('uq_users_username_lower', func.lower(username), unique=True),
+        Index('uq_users_email_lower', func.lower(email), unique=True),
     )
 
+    # Fetch id and created_at via INSERT ... RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
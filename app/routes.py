@@ -1,53 +1,106 @@
 """
 API routes for user management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Annotated
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from app.config import BULK_CREATE_MAX_USERS
 from app.database import get_db
 from app.schemas import UserCreate, UserRead
-from app.crud import create_user, get_user_by_username, get_user_by_email
+from app.crud import create_user, create_users_bulk
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+def _duplicate_detail(error: IntegrityError) -> str:
+    """
+    Build the error message for a unique constraint violation.
+
+    Args:
+        error: IntegrityError raised by the INSERT
+
+    Returns:
+        Message naming the duplicated field when the driver reports it
+    """
+    # asyncpg's UniqueViolationError is chained behind SQLAlchemy's DBAPI adapter
+    cause = getattr(error.orig, "__cause__", None)
+    constraint = getattr(cause, "constraint_name", None) or ""
+    if "username" in constraint:
+        return "Username already registered"
+    if "email" in constraint:
+        return "Email already registered"
+    return "Username or email already exists"
+
+
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_new_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new user.
-    
+
+    Uniqueness is enforced by the database constraints on username and
+    email, so the INSERT is the only round-trip on the happy path.
+
+    The ORM row is the source of truth for the response, so UserRead is
+    built with model_construct and returned as a ready response, skipping
+    FastAPI's response validation. response_model still documents it.
+
     Args:
         user: UserCreate schema with username, email, and password
         db: Database session
-        
+
     Returns:
         Created user (UserRead schema)
-        
+
     Raises:
         HTTPException 400: If username or email already exists
     """
-    # Check if username exists
-    existing_user = get_user_by_username(db, user.username)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # Check if email exists
-    existing_email = get_user_by_email(db, user.email)
-    if existing_email:
+    try:
+        db_user = await create_user(db, user)
+    except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
+            detail=_duplicate_detail(e)
         )
-    
-    # Create user
+
+    user_read = UserRead.model_construct(
+        id=db_user.id,
+        username=db_user.username,
+        email=db_user.email,
+        created_at=db_user.created_at
+    )
+    return ORJSONResponse(
+        content=user_read.model_dump(mode="json"),
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post("/bulk", response_model=list[UserRead], status_code=status.HTTP_201_CREATED)
+async def create_new_users_bulk(
+    users: Annotated[list[UserCreate], Body(max_length=BULK_CREATE_MAX_USERS)],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many users at once, e.g. for admin bootstrap or migrations.
+
+    The batch is all-or-nothing: one duplicate rejects every user in it.
+    Batches larger than BULK_CREATE_MAX_USERS are rejected with 422.
+
+    Args:
+        users: UserCreate schemas with username, email, and password
+        db: Database session
+
+    Returns:
+        Created users (UserRead schemas)
+
+    Raises:
+        HTTPException 400: If any username or email already exists
+    """
     try:
-        db_user = create_user(db, user)
-        return db_user
-    except IntegrityError:
+        return await create_users_bulk(db, users)
+    except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username or email already exists"
+            detail=_duplicate_detail(e)
         )
@@ -1,7 +1,8 @@
 """
 Pydantic schemas for request/response validation.
 """
-from datetime import datetime
+from datetime import datetime, timezone
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 
@@ -18,9 +19,29 @@ class UserRead(BaseModel):
     """
     Schema for reading user data (excludes password_hash).
     """
-    id: int
+    id: UUID
     username: str
     email: str
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+def warm_up_schemas() -> None:
+    """
+    Exercise request validation and response serialization once at startup.
+
+    This loads email_validator and runs the first-call paths of the
+    validators and serializers before the first real request arrives.
+    """
+    UserCreate.model_validate({
+        "username": "warm_up_1",
+        "email": "warm_up@example.com",
+        "password": "warm_up_12"
+    })
+    UserRead.model_construct(
+        id=UUID(int=0),
+        username="warm_up_1",
+        email="warm_up@example.com",
+        created_at=datetime.now(timezone.utc)
+    ).model_dump(mode="json")
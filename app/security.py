@@ -1,33 +1,304 @@
 """
-Password hashing and verification using bcrypt.
+Password hashing and verification using argon2id.
 """
-from passlib.context import CryptContext
+import asyncio
+import hmac
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from app.config import ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM
+
+# Upper bound for the startup calibration search
+MAX_HASH_TIME_COST = 10
+# Timed probes per candidate cost; the median is compared with the target
+_CALIBRATION_PROBES = 3
+
+
+def _make_hasher(time_cost: int) -> PasswordHasher:
+    """
+    Build an argon2id hasher with the configured memory and parallelism.
+
+    Args:
+        time_cost: Number of argon2 iterations
+
+    Returns:
+        PasswordHasher instance
+    """
+    return PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=ARGON2_MEMORY_COST,
+        parallelism=ARGON2_PARALLELISM,
+        hash_len=32
+    )
+
+
+_ph = _make_hasher(ARGON2_TIME_COST)
+
+# Successful verifications keyed on (HMAC-SHA256(password), stored hash). The HMAC key
+# is random per process, so cached digests cannot be brute-forced offline like a plain
+# SHA-256; the plain password never leaves verify_password.
+_CACHE_SECRET = os.urandom(32)
+_VERIFY_CACHE_SIZE = 4096
+_verify_cache: OrderedDict[tuple[bytes, str], bool] = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Created on first use so importing this module never forks worker processes
+_hash_pool: ProcessPoolExecutor | None = None
+
+# Bulk hashing may occupy at most half the pool, leaving workers for single registrations
+_BULK_HASH_CONCURRENCY = max(1, (os.cpu_count() or 2) // 2)
+_bulk_semaphore: asyncio.Semaphore | None = None
+_bulk_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool used for CPU-bound password hashing.
+
+    Workers are started via forkserver rather than fork, since the pool is
+    created inside the running server where other threads already exist.
+
+    Returns:
+        Shared ProcessPoolExecutor with one worker per CPU
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=_set_time_cost,
+            initargs=(_ph.time_cost,)
+        )
+    return _hash_pool
+
+
+def _replace_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool broken by a dead worker (e.g. an OOM kill).
+
+    Only the given pool is touched: if another caller already replaced it,
+    the current pool is left alone so its queued work is not cancelled.
+    """
+    global _hash_pool
+    if _hash_pool is pool:
+        _hash_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Run a function on the hashing pool, retrying once on a fresh pool if it broke.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_hash_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        _replace_broken_pool(pool)
+        return await loop.run_in_executor(get_hash_pool(), func, *args)
+
+
+def shutdown_hash_pool() -> None:
+    """
+    Shut down the hashing process pool if it was started.
+    """
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
+
+def _set_time_cost(time_cost: int) -> None:
+    """
+    Replace the module hasher; also the pool initializer so workers match the parent.
+    """
+    global _ph
+    _ph = _make_hasher(time_cost)
+
+
+def calibrate_hash_cost(target_seconds: float, max_time_cost: int = MAX_HASH_TIME_COST) -> int:
+    """
+    Pick the argon2 time_cost for this host.
+
+    Starting from ARGON2_TIME_COST, the cost is raised while the median of
+    a few timed hashes stays within the target; an untimed hash first warms
+    up the allocator and caches. The configured cost is a floor and is kept
+    even if it already exceeds the target. Any running hashing pool is
+    restarted so its workers pick up the new cost.
+
+    Args:
+        target_seconds: Maximum time one hash should take
+        max_time_cost: Upper bound for the search
+
+    Returns:
+        The selected time_cost
+    """
+    selected = ARGON2_TIME_COST
+    for time_cost in range(ARGON2_TIME_COST, max_time_cost + 1):
+        hasher = _make_hasher(time_cost)
+        hasher.hash("calibration-probe")
+        timings = []
+        for _ in range(_CALIBRATION_PROBES):
+            start = time.perf_counter()
+            hasher.hash("calibration-probe")
+            timings.append(time.perf_counter() - start)
+        if statistics.median(timings) > target_seconds:
+            break
+        selected = time_cost
+
+    _set_time_cost(selected)
+    shutdown_hash_pool()
+    return selected
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a plain password using bcrypt.
-    
+    Hash a plain password using argon2id.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    return _ph.hash(password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a plain password on the hashing process pool.
+
     Args:
         password: Plain text password
-        
+
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return await _run_in_hash_pool(hash_password, password)
+
+
+def _get_bulk_semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding bulk hashing jobs for the running event loop.
+    """
+    global _bulk_semaphore, _bulk_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _bulk_semaphore is None or _bulk_semaphore_loop is not loop:
+        _bulk_semaphore = asyncio.Semaphore(_BULK_HASH_CONCURRENCY)
+        _bulk_semaphore_loop = loop
+    return _bulk_semaphore
+
+
+async def hash_passwords_bulk(passwords: list[str]) -> list[str]:
+    """
+    Hash a batch of passwords without monopolising the hashing pool.
+
+    At most half the pool's workers run bulk jobs at once, across all
+    concurrent bulk requests, so single registrations are not queued
+    behind a whole batch.
+
+    Args:
+        passwords: Plain text passwords
+
+    Returns:
+        Hashed passwords, in input order
+    """
+    semaphore = _get_bulk_semaphore()
+
+    async def _hash_one(password: str) -> str:
+        async with semaphore:
+            return await hash_password_async(password)
+
+    return list(await asyncio.gather(*(_hash_one(password) for password in passwords)))
+
+
+def _cache_key(plain_password: str, hashed_password: str) -> tuple[bytes, str]:
+    """
+    Build the verification cache key without keeping the plain password.
+    """
+    return hmac.digest(_CACHE_SECRET, plain_password.encode(), "sha256"), hashed_password
+
+
+def _cache_hit(key: tuple[bytes, str]) -> bool:
+    """
+    Check the verification cache, marking the entry as recently used.
+    """
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return True
+    return False
+
+
+def _cache_store(key: tuple[bytes, str]) -> None:
+    """
+    Record a successful verification, evicting the oldest entry when full.
+    """
+    with _verify_cache_lock:
+        _verify_cache[key] = True
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+
+
+def _verify_uncached(plain_password: str, hashed_password: str) -> bool:
+    """
+    Run the argon2 verification; module-level so the process pool can pickle it.
+    """
+    try:
+        return _ph.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
-    
+
+    Repeat verifications of the same password/hash pair are served from
+    an LRU cache so they skip the argon2 computation.
+
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password from database
-        
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    key = _cache_key(plain_password, hashed_password)
+    if _cache_hit(key):
+        return True
+    if not _verify_uncached(plain_password, hashed_password):
+        return False
+    _cache_store(key)
+    return True
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password on the hashing process pool.
+
+    Shares the verification cache with verify_password; only cache misses
+    are sent to the pool.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    key = _cache_key(plain_password, hashed_password)
+    if _cache_hit(key):
+        return True
+    if not await _run_in_hash_pool(_verify_uncached, plain_password, hashed_password):
+        return False
+    _cache_store(key)
+    return True